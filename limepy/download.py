@@ -4,12 +4,31 @@ Documentation: https://api.limesurvey.org/classes/remotecontrol_handle.html
 """
 
 import base64
+import json
+import re
 import requests
+try:
+    import orjson
+except ImportError:
+    orjson = None
 
 ENDPOINT = '{}/index.php/admin/remotecontrol'
+HEADERS = {'Content-Type': 'application/json'}
+RESULT_KEY = re.compile(rb'"result"\s*:')
 
 
-def get_session_key(base_url, user_name, password, user_id):
+if orjson:
+    loads = orjson.loads
+    dumps = orjson.dumps
+else:
+    loads = json.loads
+
+    def dumps(obj):
+        """Serialise obj to json bytes"""
+        return json.dumps(obj).encode()
+
+
+def get_session_key(base_url, user_name, password, user_id, session=None):
     """Get session key"""
 
     api_url = ENDPOINT.format(base_url)
@@ -18,14 +37,67 @@ def get_session_key(base_url, user_name, password, user_id):
         'params': [user_name, password],
         'id': user_id
     }
-    req = requests.post(api_url, json=payload)
-    return req.json()
+    post = session.post if session else requests.post
+    req = post(api_url, data=dumps(payload), headers=HEADERS)
+    return loads(req.content)
+
+
+def decode_export(req, chunk_size=65536):
+    """Decode the base64 encoded result of a streamed export response.
+
+    The result is decoded chunk by chunk while it is being read, so the
+    encoded export is never held in memory as a whole.
+
+    :param req: response, requested with stream=True
+    :param chunk_size: number of bytes to read at a time
+
+    """
+
+    head = b''
+    encoded = b''
+    decoded = bytearray()
+    state = 'head'
+    for chunk in req.iter_content(chunk_size):
+        if state == 'head':
+            head += chunk
+            key = RESULT_KEY.search(head)
+            if not key:
+                continue
+            value = head[key.end():].lstrip(b' \t\r\n')
+            if not value:
+                continue
+            if not value.startswith(b'"'):
+                state = 'object'
+                continue
+            state = 'string'
+            chunk = value[1:]
+        if state == 'string':
+            end = chunk.find(b'"')
+            if end != -1:
+                chunk = chunk[:end]
+                state = 'tail'
+            # json encoders may escape the slashes in base64
+            encoded += chunk.replace(b'\\', b'')
+            usable = len(encoded) // 4 * 4
+            decoded += base64.b64decode(encoded[:usable])
+            encoded = encoded[usable:]
+        elif state == 'object':
+            head += chunk
+    if state != 'tail':
+        result = loads(head)['result']
+        if 'status' in result:
+            raise ValueError(result['status'])
+        raise ValueError(result)
+    if encoded:
+        raise ValueError('Export result is not valid base64')
+    return decoded
 
 
 def export_responses(user_id, base_url, session_key, sid, lang=None,
                      document_type='csv', completion_status='all',
                      heading_type='code', response_type='short',
-                     from_response_id=None, to_response_id=None, fields=None):
+                     from_response_id=None, to_response_id=None, fields=None,
+                     session=None):
     """Export responses"""
 
     api_url = ENDPOINT.format(base_url)
@@ -36,15 +108,14 @@ def export_responses(user_id, base_url, session_key, sid, lang=None,
                    to_response_id, fields],
         'id': user_id
     }
-    req = requests.post(api_url, json=payload)
-    result = req.json()['result']
-    if 'status' in result:
-        raise ValueError(result['status'])
-    csv = base64.b64decode(result.encode()).decode('utf-8-sig')
+    post = session.post if session else requests.post
+    req = post(api_url, data=dumps(payload), headers=HEADERS,
+               stream=True)
+    csv = decode_export(req).decode('utf-8-sig')
     return csv
 
 
-def release_session_key(base_url, session_key, user_id):
+def release_session_key(base_url, session_key, user_id, session=None):
     """Release session key"""
 
     api_url = ENDPOINT.format(base_url)
@@ -53,8 +124,9 @@ def release_session_key(base_url, session_key, user_id):
         'params': [session_key],
         'id': user_id
     }
-    req = requests.post(api_url, json=payload)
-    return req.json()['result']
+    post = session.post if session else requests.post
+    req = post(api_url, data=dumps(payload), headers=HEADERS)
+    return loads(req.content)['result']
 
 
 def get_responses(base_url, user_name, password, user_id, sid, lang=None,
@@ -80,11 +152,13 @@ def get_responses(base_url, user_name, password, user_id, sid, lang=None,
     :param fields: for partial export (Default value = None)
 
     """
-    session_key = get_session_key(base_url, user_name, password, user_id)
-    session_key = session_key['result']
-    csv = export_responses(user_id, base_url, session_key, sid, lang,
-                           document_type, completion_status, heading_type,
-                           response_type, from_response_id, to_response_id,
-                           fields)
-    release_session_key(base_url, session_key, user_id)
+    with requests.Session() as session:
+        session_key = get_session_key(base_url, user_name, password, user_id,
+                                      session)
+        session_key = session_key['result']
+        csv = export_responses(user_id, base_url, session_key, sid, lang,
+                               document_type, completion_status, heading_type,
+                               response_type, from_response_id, to_response_id,
+                               fields, session)
+        release_session_key(base_url, session_key, user_id, session)
     return csv
@@ -1,11 +1,13 @@
 """Process and summarise data from LimeSurvey survey."""
 
 from collections import OrderedDict
+from functools import cached_property
+import io
 import re
 from html.parser import HTMLParser
 import pandas as pd
 import numpy as np
-import xmltodict
+from lxml import etree
 
 QUESTION_TYPES = {
     'F': 'Array',
@@ -28,6 +30,9 @@ QUESTION_TYPES = {
     'N': 'Numerical input',
 }
 
+BRACKET_RE = re.compile(r'(.*?)\[(.*)\]$')
+TAG_RE = re.compile(r'<[^<]+?>')
+
 
 class StripTags(HTMLParser):
     """Strip html tags"""
@@ -51,9 +56,9 @@ class Survey():
         self.dataframe = dataframe
         self.language = language
         self.strip_tags = strip_tags
+        self.column_groups = self.group_columns()
         self.questions, self.groups = self.parse_structure(structure)
         self.question_list = self.create_question_list()
-        self.readable_df = self.create_readable_df()
 
 
     def strp_tgs(self, html):
@@ -70,25 +75,54 @@ class Survey():
             return QUESTION_TYPES[question_type_code]
         return question_type_code
 
+    def group_columns(self):
+        """Map question titles to the indices of their columns."""
+
+        column_groups = {}
+        for i, colname in enumerate(self.dataframe.columns):
+            title = colname.split('[', 1)[0]
+            column_groups.setdefault(title, []).append(i)
+        return column_groups
+
     def get_columns(self, question):
         """Identify column names associated with question."""
 
-        title = question['title']
-        indices = [i for i, c in enumerate(self.dataframe.columns)
-                   if c.split('[')[0] == title]
+        indices = self.column_groups.get(question['title'])
         if not indices:
             indices = [-99, -99]
         return min(indices), len(indices)
 
+    def read_structure(self, structure):
+        """Read languages and rows per section from the .lss document."""
+
+        if isinstance(structure, str):
+            structure = structure.encode()
+        languages = []
+        document = {}
+        rows = etree.iterparse(io.BytesIO(structure), events=('end',),
+                               tag=('language', 'row'), huge_tree=True,
+                               resolve_entities=False)
+        for _, elem in rows:
+            if elem.tag == 'language':
+                if elem.getparent().tag == 'languages':
+                    languages.append(elem.text.strip())
+                continue
+            section = elem.getparent().getparent().tag
+            row = {
+                child.tag: (child.text or '').strip() or None
+                for child
+                in elem
+            }
+            document.setdefault(section, []).append(row)
+            elem.clear()
+            while elem.getprevious() is not None:
+                del elem.getparent()[0]
+        return languages, document
+
     def parse_structure(self, structure):
         """Parse the structure of the survey."""
 
-        if isinstance(structure, str):
-            structure = xmltodict.parse(structure)
-        document = structure['document']
-        languages = document['languages']['language']
-        if not isinstance(languages, list):
-            languages = [languages]
+        languages, document = self.read_structure(structure)
         if not self.language:
             language = languages[0]
         else:
@@ -98,9 +132,7 @@ class Survey():
             raise ValueError(message)
         groups = OrderedDict()
         if 'question_l10ns' in document:
-            items = document['question_l10ns']['rows']['row']
-            if not isinstance(items, list):
-                items = [items]
+            items = document['question_l10ns']
             question_l10ns = {
                 item['qid']:item['question']
                 for item
@@ -115,7 +147,7 @@ class Survey():
                 and 'help' in item
             }
         if 'answer_l10ns' in document:
-            items = document['answer_l10ns']['rows']['row']
+            items = document['answer_l10ns']
             answer_l10ns = {
                 item['aid']:item['answer']
                 for item
@@ -123,36 +155,24 @@ class Survey():
                 if item['language'] == language
             }
         if 'group_l10ns' in document:
-            items = document['group_l10ns']['rows']['row']
-            if isinstance(items, (OrderedDict, dict)):
-                group_l10ns = {items['gid']: items['group_name']}
-            else:
-                group_l10ns = {
-                    item['gid']:item['group_name']
-                    for item
-                    in items
-                    if item['language'] == language
-                }
+            items = document['group_l10ns']
+            group_l10ns = {
+                item['gid']:item['group_name']
+                for item
+                in items
+                if item['language'] == language
+            }
         questions = OrderedDict()
         start_columns = []
         groups = {}
-        if not isinstance(document['groups']['rows']['row'], list):
-            group = document['groups']['rows']['row']
+        for group in document['groups']:
+            if 'language' in group and group['language'] != language:
+                continue
             if 'group_name' not in group:
                 group['group_name'] = group_l10ns[group['gid']]
             groups[group['gid']] = group
-        else:
-            for group in document['groups']['rows']['row']:
-                if 'language' in group and group['language'] != language:
-                    continue
-                if 'group_name' not in group:
-                    group['group_name'] = group_l10ns[group['gid']]
-                groups[group['gid']] = group
-
-        question_list = document['questions']['rows']['row']
-        if not isinstance(question_list, list):
-            question_list = [question_list]
-        for question in question_list:
+
+        for question in document['questions']:
             if 'language' in question and question['language'] != language:
                 continue
             qid = question['qid']
@@ -177,7 +197,7 @@ class Survey():
                 groups[gid]['questions'] = []
             groups[gid]['questions'].append(qid)
         if 'answers' in document.keys():
-            for answer in document['answers']['rows']['row']:
+            for answer in document['answers']:
                 if 'language' in answer and answer['language'] != language:
                     continue
                 qid = answer['qid']
@@ -189,8 +209,16 @@ class Survey():
                 if scale not in questions[qid]['answers']:
                     questions[qid]['answers'][scale] = []
                 questions[qid]['answers'][scale].append(answer)
+            for question in questions.values():
+                if 'answers' not in question:
+                    continue
+                answer_map = {}
+                for scale in question['answers'].values():
+                    for answer in scale:
+                        answer_map.setdefault(answer['code'], answer['answer'])
+                question['answer_map'] = answer_map
         if 'subquestions' in document.keys():
-            for subquestion in document['subquestions']['rows']['row']:
+            for subquestion in document['subquestions']:
                 if 'language' in subquestion and subquestion['language'] != language:
                     continue
                 parent_qid = subquestion['parent_qid']
@@ -203,16 +231,15 @@ class Survey():
                     questions[parent_qid]['subquestions'][scale] = []
                 questions[parent_qid]['subquestions'][scale].append(subquestion)
         if 'question_attributes' in document.keys():
-            for attribute in document['question_attributes']['rows']['row']:
-                if isinstance(attribute, dict):
-                    qid = attribute['qid']
-                    if 'attributes' not in questions[qid]:
-                        questions[qid]['attributes'] = []
-                    questions[qid]['attributes'].append(attribute)
-                    if (attribute['attribute'] == 'multiflexible_checkbox'
-                            and attribute['value'] == '1'):
-                        question_type = 'Array (Numbers) Checkbox layout'
-                        questions[qid]['question_type'] = question_type
+            for attribute in document['question_attributes']:
+                qid = attribute['qid']
+                if 'attributes' not in questions[qid]:
+                    questions[qid]['attributes'] = []
+                questions[qid]['attributes'].append(attribute)
+                if (attribute['attribute'] == 'multiflexible_checkbox'
+                        and attribute['value'] == '1'):
+                    question_type = 'Array (Numbers) Checkbox layout'
+                    questions[qid]['question_type'] = question_type
         start_columns = sorted(start_columns)
         for qid, question in questions.items():
             position = float(start_columns.index(question['columns'][0]))
@@ -222,34 +249,36 @@ class Survey():
     def create_question_list(self):
         """Create table of questions with metadata"""
 
-        question_list = pd.DataFrame()
+        rows = {}
         for qid, question in self.questions.items():
-            question_list.loc[qid, 'question'] = question['question']
-            question_list.loc[qid, 'question_type'] = question['question_type']
-            question_list.loc[qid, 'help'] = question['help']
-            question_list.loc[qid, 'position'] = question['position']
             start, nr_columns = question['columns']
-            question_list.loc[qid, 'start'] = int(start)
-            question_list.loc[qid, 'nr_columns'] = int(nr_columns)
-            group_name = self.groups[question['gid']]['group_name']
-            question_list.loc[qid, 'group'] = group_name
-            question_list.loc[qid, 'mandatory'] = question['mandatory']
-            question_list.loc[qid, 'other'] = question['other']
-            question_list.loc[qid, 'title'] = question['title']
+            rows[qid] = {
+                'question': question['question'],
+                'question_type': question['question_type'],
+                'help': question['help'],
+                'position': question['position'],
+                'start': int(start),
+                'nr_columns': int(nr_columns),
+                'group': self.groups[question['gid']]['group_name'],
+                'mandatory': question['mandatory'],
+                'other': question['other'],
+                'title': question['title'],
+            }
+        question_list = pd.DataFrame.from_dict(rows, orient='index')
         return question_list.sort_values(by='position')
 
-    def code_to_answer(self, value, mapping):
-        """Replace answer code with answer"""
-        if pd.isnull(value):
-            return None
-        if value in mapping:
-            return mapping[value]
-        return value
+    @cached_property
+    def readable_df(self):
+        """Dataframe with readable colnames and values, created on first use"""
+        return self.create_readable_df()
 
     def create_readable_df(self):
         """Create dataframe with readable colnames and values"""
         readable_df = self.dataframe.copy()
         colnames = list(self.dataframe.columns)
+        dtypes = list(self.dataframe.dtypes)
+        parts = pd.Series(colnames).str.replace('\n', ' ')
+        parts = parts.str.extract(BRACKET_RE)
         for _, question in self.questions.items():
             start, nr_columns = question['columns']
             if start == -99:
@@ -260,11 +289,8 @@ class Survey():
                     for answer in question['answers'][scale]:
                         mapping[answer['code']] = answer['answer']
             for i in range(start, start + nr_columns):
-                colname = colnames[i]
-                colname = colname.replace('\n', ' ')
-                parts = re.match(r'(.*?)\[(.*)\]$', colname)
-                if parts:
-                    last = parts.groups()[-1]
+                last = parts.iat[i, 1]
+                if pd.notnull(last):
                     last = last.split('_')
                     if 'subquestions' in question:
                         for scale in question['subquestions']:
@@ -278,8 +304,16 @@ class Survey():
                     colname = question['question']
                 if colname:
                     colnames[i] = colname
-                if mapping:
-                    readable_df.iloc[:, i] = readable_df.iloc[:, i].map(lambda x: self.code_to_answer(x, mapping))
+            # answer codes are strings, so numerical columns need no recoding
+            columns = [
+                i
+                for i
+                in range(start, start + nr_columns)
+                if not pd.api.types.is_numeric_dtype(dtypes[i])
+            ]
+            if mapping and columns:
+                block = readable_df.iloc[:, columns]
+                readable_df.iloc[:, columns] = block.replace(mapping)
 
         readable_df.columns = colnames
         return readable_df
@@ -287,11 +321,7 @@ class Survey():
     def get_answer(self, question, answer_code):
         """Look up the answer beloning to an answer code."""
 
-        for scale in question['answers']:
-            for answer in question['answers'][scale]:
-                if answer['code'] == answer_code:
-                    return answer['answer']
-        return answer_code
+        return question['answer_map'].get(answer_code, answer_code)
 
     def recode_checkbox(self, value):
         """
@@ -315,68 +345,69 @@ class Survey():
         """
 
         current_group_id = ''
-        respondent = f'Respondent ID: {respondent_id}\n\n'
+        row = self.dataframe.loc[respondent_id]
+        parts = [f'Respondent ID: {respondent_id}\n\n']
         for qid in self.question_list.index:
             question = self.questions[qid]
             if question['type'] in ignore:
                 continue
             if question['gid'] != current_group_id:
                 group_title = self.groups[question['gid']]['group_name'].upper()
-                respondent += group_title + '\n\n'
+                parts.append(group_title + '\n\n')
                 current_group_id = question['gid']
             if isinstance(question['question'], str):
-                respondent += question['question'] + '\n'
+                parts.append(question['question'] + '\n')
             else:
-                respondent += f'[question {qid}]'
+                parts.append(f'[question {qid}]')
 
             # List (radio, dropdown)
             if question['type'] in ['!', 'L', 'O']:
                 colname = question['title']
-                value = self.dataframe.loc[respondent_id, colname]
+                value = row[colname]
                 value = self.get_answer(question, value)
-                respondent += f'- {value}\n'
+                parts.append(f'- {value}\n')
                 if question['other'] == 'Y':
                     colname = f"{question['title']}[other]"
-                    value = self.dataframe.loc[respondent_id, colname]
+                    value = row[colname]
                     if pd.notnull(value):
-                        respondent += f"- Other: {value}\n"
-                respondent += '\n'
+                        parts.append(f"- Other: {value}\n")
+                parts.append('\n')
 
             # Other single-column question
             elif question['title'] in self.dataframe.columns:
-                value = self.dataframe.loc[respondent_id, question['title']]
-                respondent += f"- {value}\n"
+                value = row[question['title']]
+                parts.append(f"- {value}\n")
                 if question['other'] == 'Y':
                     colname = f"{question['title']}[other]"
-                    value = self.dataframe.loc[respondent_id, colname]
+                    value = row[colname]
                     if pd.notnull(value):
-                        respondent += f"- Other: {value}\n"
-                respondent += '\n'
+                        parts.append(f"- Other: {value}\n")
+                parts.append('\n')
 
             # Multiple choice
             elif question['type'] in ['M', 'P']:
                 for subquestion in question['subquestions']['0']:
                     colname = f"{question['title']}[{subquestion['title']}]"
-                    value = self.dataframe.loc[respondent_id, colname]
+                    value = row[colname]
                     value = self.recode_checkbox(value)
                     label = subquestion['question']
-                    respondent += f"- {label}: {value}\n"
+                    parts.append(f"- {label}: {value}\n")
                 if question['other'] == 'Y':
                     colname = f"{question['title']}[other]"
-                    value = self.dataframe.loc[respondent_id, colname]
+                    value = row[colname]
                     if pd.notnull(value):
-                        respondent += f"- Other: {value}\n"
-                respondent += '\n'
+                        parts.append(f"- Other: {value}\n")
+                parts.append('\n')
 
             # Array
             elif question['type'] in ['F']:
                 for subquestion in question['subquestions']['0']:
                     colname = f"{question['title']}[{subquestion['title']}]"
                     label = subquestion['question']
-                    value = self.dataframe.loc[respondent_id, colname]
+                    value = row[colname]
                     value = self.get_answer(question, value)
-                    respondent += f"- {label}: {value}\n"
-                respondent += '\n'
+                    parts.append(f"- {label}: {value}\n")
+                parts.append('\n')
 
             # Array (Numbers) or Checkbox Array
             elif question['type'] in [':', ';']:
@@ -389,41 +420,42 @@ class Survey():
                         colname = (f"{question['title']}"
                                    f"[{subquestion_0['title']}"
                                    f"_{subquestion_1['title']}]")
-                        value = self.dataframe.loc[respondent_id, colname]
+                        value = row[colname]
                         if checkbox:
                             value = self.recode_checkbox(value)
-                        respondent += f"- {label_0}, {label_1}: {value}\n"
-                respondent += '\n'
+                        parts.append(f"- {label_0}, {label_1}: {value}\n")
+                parts.append('\n')
 
             # Multiple numerical
             elif question['type'] in ['K']:
                 for subquestion in question['subquestions']['0']:
                     colname = f"{question['title']}[{subquestion['title']}]"
-                    value = self.dataframe.loc[respondent_id, colname]
+                    value = row[colname]
                     label = subquestion['question']
-                    respondent += f"- {label}: {value}\n"
+                    parts.append(f"- {label}: {value}\n")
                 if question['other'] == 'Y':
                     colname = f"{question['title']}[other]"
-                    value = self.dataframe.loc[respondent_id, colname]
-                    respondent += f"- Other: {value}\n"
-                respondent += '\n'
+                    value = row[colname]
+                    parts.append(f"- Other: {value}\n")
+                parts.append('\n')
 
             # Ranking
             elif question['type'] == 'R':
                 answers = question['answers']['0']
                 for i in range(len(answers)):
                     colname = f"{question['title']}[{i + 1}]"
-                    answer_code = self.dataframe.loc[respondent_id, colname]
+                    answer_code = row[colname]
                     value = self.get_answer(question, answer_code)
-                    respondent += f"- {i + 1}: {value}\n"
-                respondent += '\n'
+                    parts.append(f"- {i + 1}: {value}\n")
+                parts.append('\n')
 
             # Not implemented
             else:
-                respondent += "Question type not implemented\n\n"
+                parts.append("Question type not implemented\n\n")
 
+        respondent = ''.join(parts)
         if strip_tags:
-            respondent = re.sub('<[^<]+?>', '', respondent)
+            respondent = TAG_RE.sub('', respondent)
         return respondent
 
     def __repr__(self):
@@ -472,7 +504,7 @@ class Question():
         """Summarise answers to question"""
 
         summary = pd.DataFrame()
-        valid = []
+        valid_mask = np.zeros(len(self.subset), dtype=bool)
 
         # Numerical input
         if self.type in ['N']:
@@ -484,46 +516,48 @@ class Question():
         if self.type in ['!', 'L', 'O', '5']:
             colname = self.metadata['title']
             values = self.subset[colname]
-            valid = [i for i, v in enumerate(values) if pd.notnull(v)]
+            valid_mask |= values.notna().to_numpy()
             if self.type == '5':
                 answers = [{'answer': a, 'code': a} for a in range(1, 6)]
             else:
                 answers = self.metadata['answers']['0']
+            codes = [answer['code'] for answer in answers]
+            counts = values.value_counts().reindex(codes, fill_value=0)
             for answer in answers:
-                count = list(values).count(answer['code'])
+                count = counts.loc[answer['code']]
                 summary.loc[answer['answer'], 'Count'] = count
             if self.metadata['other'] == 'Y':
                 colname = f"{self.metadata['title']}[other]"
-                other = [i for i, v in enumerate(self.subset[colname])
-                         if pd.notnull(v)]
-                summary.loc['Other', 'Count'] = len(other)
-                valid.extend(other)
+                other = self.subset[colname].notna().to_numpy()
+                summary.loc['Other', 'Count'] = other.sum()
+                valid_mask |= other
 
         # Multiple Choice
         if self.type in ['M', 'P']:
             for subquestion in self.metadata['subquestions']['0']:
                 colname = f"{self.metadata['title']}[{subquestion['title']}]"
-                values = [pd.notnull(v) for v in self.subset[colname]]
+                values = self.subset[colname].notna().to_numpy()
                 label = subquestion['question']
-                summary.loc[label, 'Count'] = sum(values)
-                valid.extend([i for i, v in enumerate(values) if v == 1])
+                summary.loc[label, 'Count'] = values.sum()
+                valid_mask |= values
             if self.metadata['other'] == 'Y':
                 colname = f"{self.metadata['title']}[other]"
-                other = [i for i, v in enumerate(self.subset[colname])
-                         if pd.notnull(v)]
-                summary.loc['Other', 'Count'] = len(other)
-                valid.extend(other)
+                other = self.subset[colname].notna().to_numpy()
+                summary.loc['Other', 'Count'] = other.sum()
+                valid_mask |= other
 
         # Array
         if self.type == 'F':
             for subquestion in self.metadata['subquestions']['0']:
                 colname = f"{self.metadata['title']}[{subquestion['title']}]"
                 values = self.subset[colname]
-                valid.extend([i for i, v in enumerate(values)
-                              if pd.notnull(v)])
+                valid_mask |= values.notna().to_numpy()
                 sq_label = subquestion['question']
-                for answer in self.metadata['answers']['0']:
-                    count = list(values).count(answer['code'])
+                answers = self.metadata['answers']['0']
+                codes = [answer['code'] for answer in answers]
+                counts = values.value_counts().reindex(codes, fill_value=0)
+                for answer in answers:
+                    count = counts.loc[answer['code']]
                     answer_label = answer['answer']
                     summary.loc[sq_label, answer_label] = count
 
@@ -533,11 +567,9 @@ class Question():
                 label = subquestion['question']
                 colname = f"{self.metadata['title']}[{subquestion['title']}]"
                 values = self.subset[colname]
-                valid.extend([i for i, v in enumerate(values)
-                              if pd.notnull(v)])
-                valid_values = [v for v in values if pd.notnull(v)]
-                summary.loc[label, 'mean'] = np.mean(valid_values)
-                summary.loc[label, 'median'] = np.median(valid_values)
+                valid_mask |= values.notna().to_numpy()
+                summary.loc[label, 'mean'] = values.mean()
+                summary.loc[label, 'median'] = values.median()
 
         # Array (Numbers) or Checkbox Array
         if self.type in [':']:
@@ -554,48 +586,46 @@ class Question():
                                f"[{subquestion_0['title']}"
                                f"_{subquestion_1['title']}]")
                     values = self.subset[colname]
-                    valid.extend([i for i, v in enumerate(values)
-                                  if pd.notnull(v)])
+                    valid_mask |= values.notna().to_numpy()
                     if checkbox:
-                        value = sum((v == 1) for v in values)
+                        value = (values == 1).sum()
                     else:
-                        valid_values = [float(v) for v in values
-                                        if pd.notnull(v)]
+                        values = pd.to_numeric(values)
                         if self.method == 'mean':
-                            value = np.mean(valid_values)
+                            value = values.mean()
                         if self.method == 'median':
-                            value = np.median(valid_values)
+                            value = values.median()
                     summary.loc[label_0, label_1] = value
 
         # Ranking
         if self.type == 'R':
             answers = self.metadata['answers']['0']
-            points = len(answers)
-            for i in range(len(answers)):
-                colname = f"{self.metadata['title']}[{i + 1}]"
-                values = self.subset[colname]
-                if i == 0:
-                    valid = [i for i, v in enumerate(values) if pd.notnull(v)]
-                for answer in answers:
-                    score = (points * list(values).count(answer['code'])
-                             / len(valid))
-                    try:
-                        summary.loc[answer['answer'], 'Points'] += score
-                    except KeyError:
-                        summary.loc[answer['answer'], 'Points'] = score
-                points -= 1
+            colnames = [f"{self.metadata['title']}[{i + 1}]"
+                        for i in range(len(answers))]
+            ranks = self.subset[colnames]
+            valid_mask |= ranks.iloc[:, 0].notna().to_numpy()
+            counts = pd.DataFrame({
+                i: ranks[colname].value_counts()
+                for i, colname
+                in enumerate(colnames)
+            })
+            codes = [answer['code'] for answer in answers]
+            counts = counts.reindex(index=codes, columns=range(len(answers)))
+            points = np.arange(len(answers), 0, -1)
+            scores = counts.fillna(0).to_numpy() @ points / valid_mask.sum()
+            labels = [answer['answer'] for answer in answers]
+            summary = pd.DataFrame({'Points': scores}, index=labels)
             summary = summary.sort_values(by='Points', ascending=False)
 
         # Any other question type: return columns related to question
         if summary.empty:
-            colnames = [c for c in self.subset.columns
-                        if c.split('[')[0] == self.metadata['title']]
+            indices = self.survey.column_groups.get(self.metadata['title'], [])
+            colnames = [self.subset.columns[i] for i in indices]
             for colname in colnames:
-                valid.extend([i for i, v in enumerate(self.subset[colname])
-                              if pd.notnull(v)])
+                valid_mask |= self.subset[colname].notna().to_numpy()
             summary = self.subset[colnames]
 
-        valid = set(valid)
+        valid = set(np.flatnonzero(valid_mask).tolist())
         if self.type in ['M', 'L', '!', 'O', '5', 'P']:
             ntotal = len(self.subset)
             nvalid = len(valid)
@@ -626,6 +656,15 @@ class Question():
                 and not isinstance(background_column_indices, list)):
             background_column_indices = [background_column_indices]
 
+        bg_answer_maps = {}
+        for col_index in background_column_indices or []:
+            for bg_qid, row in self.survey.question_list.iterrows():
+                if (row.start + row.nr_columns) > col_index:
+                    bg_metadata = self.survey.questions[bg_qid]
+                    answer_map = bg_metadata.get('answer_map', {})
+                    bg_answer_maps[col_index] = answer_map
+                    break
+
         text = f'{self.question.upper()}\n'
         help_txt = self.metadata['help']
         if pd.notnull(help_txt):
@@ -645,17 +684,8 @@ class Question():
                 for col_index in background_column_indices:
                     colname = self.subset.columns[col_index]
                     value = self.subset.loc[respondent, colname]
-                    for bg_qid, row in self.survey.question_list.iterrows():
-                        if (row.start + row.nr_columns) > col_index:
-                            bg_question = Question(self.survey, bg_qid)
-                            bg_metadata = bg_question.metadata
-                            break
-                    if 'answers' in bg_metadata:
-                        for scale in bg_metadata['answers']:
-                            for answer in bg_metadata['answers'][scale]:
-                                if answer['code'] == value:
-                                    value = answer['answer']
-                                    break
+                    answer_map = bg_answer_maps.get(col_index, {})
+                    value = answer_map.get(value, value)
                     respondent_txt += f"- {value}\n"
             if include_respondent:
                 text += respondent_txt + '\n\n'
@@ -14,6 +14,8 @@ setup(name='limepy',
     author_email='info@dirkmjk.nl',
     url='https://github.com/DIRKMJK/limepy',
     license="MIT",
+    python_requires='>=3.8',
     packages=['limepy'],
-    install_requires=['pandas', 'numpy', 'requests', 'xmltodict'],
+    install_requires=['pandas', 'numpy', 'requests', 'lxml>=5'],
+    extras_require={'orjson': ['orjson']},
     zip_safe=False)